@@ -0,0 +1,109 @@
+"""
+Cache keys and invalidation helpers for the cached API endpoints.
+
+The stats endpoints are read far more often than books or authors change,
+so their payloads are cached and dropped by the signal handlers in
+api/signals.py whenever the underlying data is written.
+
+The book and author read views answer conditional GETs from a data version
+token that the same handlers replace on every write, so computing an ETag
+needs a cache lookup but no database query.
+"""
+
+import hashlib
+import uuid
+from functools import wraps
+
+from django.core.cache import cache
+from django.views.decorators.cache import cache_page
+
+# Bump the version when the shape of a cached payload changes, so a deploy
+# reads fresh keys instead of needing a cache flush.
+BOOK_STATS_CACHE_VERSION = 1
+BOOK_STATS_CACHE_KEY = f'book_stats:v{BOOK_STATS_CACHE_VERSION}'
+BOOK_STATS_CACHE_TIMEOUT = 300  # seconds
+
+BOOK_COUNT_CACHE_KEY = f'book_count:v{BOOK_STATS_CACHE_VERSION}'
+
+AUTHOR_ANALYTICS_CACHE_VERSION = 1
+AUTHOR_ANALYTICS_CACHE_TIMEOUT = 600  # seconds
+AUTHOR_ANALYTICS_GENERATION_KEY = f'author_analytics:v{AUTHOR_ANALYTICS_CACHE_VERSION}:generation'
+
+# Cache-Control max-age and server-side page cache timeout for the public read views
+HTTP_CACHE_MAX_AGE = 60  # seconds
+
+DATA_VERSION_KEY = 'api_data:version'
+# The version expires with the pages cached under it: with a per-process
+# cache a write only replaces the token in its own worker, so the others must
+# not keep serving their old token (and the ETags derived from it) forever.
+DATA_VERSION_TIMEOUT = HTTP_CACHE_MAX_AGE
+
+
+def invalidate_book_stats():
+    """Drop the cached book_stats payload and book count so the next request recomputes them."""
+    cache.delete_many([BOOK_STATS_CACHE_KEY, BOOK_COUNT_CACHE_KEY])
+
+
+def author_analytics_cache_key(min_books, sort_by):
+    """
+    Build the cache key for one author_analytics parameter combination.
+    
+    The key embeds a generation token, so invalidate_author_analytics() can
+    retire every cached combination at once by replacing the token instead
+    of deleting keys by pattern.
+    """
+    generation = cache.get_or_set(AUTHOR_ANALYTICS_GENERATION_KEY, lambda: uuid.uuid4().hex, None)
+    return f'author_analytics:v{AUTHOR_ANALYTICS_CACHE_VERSION}:{generation}:{min_books}:{sort_by}'
+
+
+def invalidate_author_analytics():
+    """Retire all cached author_analytics payloads."""
+    cache.delete(AUTHOR_ANALYTICS_GENERATION_KEY)
+
+
+def data_version():
+    """Token identifying the current state of the book and author tables."""
+    return cache.get_or_set(DATA_VERSION_KEY, lambda: uuid.uuid4().hex, DATA_VERSION_TIMEOUT)
+
+
+def invalidate_data_version():
+    """Retire the data version, changing every ETag derived from it."""
+    cache.delete(DATA_VERSION_KEY)
+
+
+def invalidate_stats_caches():
+    """Drop every cached payload and ETag derived from books and authors."""
+    invalidate_book_stats()
+    invalidate_author_analytics()
+    invalidate_data_version()
+
+
+def _etag(*parts):
+    """Hash the values identifying a representation into an ETag."""
+    return hashlib.md5(repr(parts).encode(), usedforsecurity=False).hexdigest()
+
+
+def read_view_etag(request, *args, **kwargs):
+    """
+    ETag for the book and author read views: the representation is fixed by
+    the URL, the Accept header and the data version, so any book or author
+    write changes it.
+    """
+    if request.method not in ('GET', 'HEAD'):
+        return None  # The book list view also accepts POST, which needs no ETag
+    return _etag(request.get_full_path(), request.META.get('HTTP_ACCEPT', ''), data_version())
+
+
+def versioned_cache_page(timeout):
+    """
+    cache_page() with the data version in its key prefix: a write replaces the
+    version, so it retires every cached page (and the ETag stored with it)
+    along with the other derived caches instead of leaving them to expire.
+    """
+    def decorator(view_func):
+        @wraps(view_func)
+        def wrapper(request, *args, **kwargs):
+            cached_view = cache_page(timeout, key_prefix=f'page:{data_version()}')(view_func)
+            return cached_view(request, *args, **kwargs)
+        return wrapper
+    return decorator
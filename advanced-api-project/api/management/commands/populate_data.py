@@ -3,6 +3,8 @@ Management command to populate the database with sample data for testing.
 """
 
 from django.core.management.base import BaseCommand
+from django.db import transaction
+from api.cache import invalidate_stats_caches
 from api.models import Author, Book
 
 
@@ -21,37 +23,64 @@ class Command(BaseCommand):
             {'name': 'Jane Austen'},
         ]
         
-        authors = []
-        for author_data in authors_data:
-            author, created = Author.objects.get_or_create(**author_data)
-            authors.append(author)
-            if created:
-                self.stdout.write(f'Created author: {author.name}')
-            else:
-                self.stdout.write(f'Author already exists: {author.name}')
-        
         # Create sample books
         books_data = [
-            {'title': '1984', 'publication_year': 1949, 'author': authors[0]},
-            {'title': 'Animal Farm', 'publication_year': 1945, 'author': authors[0]},
-            {'title': 'Harry Potter and the Philosopher\'s Stone', 'publication_year': 1997, 'author': authors[1]},
-            {'title': 'Harry Potter and the Chamber of Secrets', 'publication_year': 1998, 'author': authors[1]},
-            {'title': 'To Kill a Mockingbird', 'publication_year': 1960, 'author': authors[2]},
-            {'title': 'The Great Gatsby', 'publication_year': 1925, 'author': authors[3]},
-            {'title': 'Pride and Prejudice', 'publication_year': 1813, 'author': authors[4]},
-            {'title': 'Emma', 'publication_year': 1815, 'author': authors[4]},
+            {'title': '1984', 'publication_year': 1949, 'author': 'George Orwell'},
+            {'title': 'Animal Farm', 'publication_year': 1945, 'author': 'George Orwell'},
+            {'title': 'Harry Potter and the Philosopher\'s Stone', 'publication_year': 1997, 'author': 'J.K. Rowling'},
+            {'title': 'Harry Potter and the Chamber of Secrets', 'publication_year': 1998, 'author': 'J.K. Rowling'},
+            {'title': 'To Kill a Mockingbird', 'publication_year': 1960, 'author': 'Harper Lee'},
+            {'title': 'The Great Gatsby', 'publication_year': 1925, 'author': 'F. Scott Fitzgerald'},
+            {'title': 'Pride and Prejudice', 'publication_year': 1813, 'author': 'Jane Austen'},
+            {'title': 'Emma', 'publication_year': 1815, 'author': 'Jane Austen'},
         ]
         
-        for book_data in books_data:
-            book, created = Book.objects.get_or_create(**book_data)
-            if created:
-                self.stdout.write(f'Created book: {book.title} by {book.author.name}')
-            else:
-                self.stdout.write(f'Book already exists: {book.title} by {book.author.name}')
+        # Insert everything in one transaction with a single INSERT per table.
+        # The unique constraints on Author.name and (Book.title, Book.author)
+        # make ignore_conflicts safe when the command is re-run.
+        with transaction.atomic():
+            author_names = [author_data['name'] for author_data in authors_data]
+            existing_authors = set(
+                Author.objects.filter(name__in=author_names).values_list('name', flat=True)
+            )
+            Author.objects.bulk_create(
+                [Author(**author_data) for author_data in authors_data],
+                ignore_conflicts=True
+            )
+            name_to_author = Author.objects.in_bulk(author_names, field_name='name')
+            
+            for name in author_names:
+                if name in existing_authors:
+                    self.stdout.write(f'Author already exists: {name}')
+                else:
+                    self.stdout.write(f'Created author: {name}')
+            
+            existing_books = set(
+                Book.objects.filter(author__in=name_to_author.values()).values_list('title', 'author__name')
+            )
+            Book.objects.bulk_create(
+                [
+                    Book(
+                        title=book_data['title'],
+                        publication_year=book_data['publication_year'],
+                        author=name_to_author[book_data['author']]
+                    )
+                    for book_data in books_data
+                ],
+                ignore_conflicts=True
+            )
+            
+            for book_data in books_data:
+                if (book_data['title'], book_data['author']) in existing_books:
+                    self.stdout.write(f'Book already exists: {book_data["title"]} by {book_data["author"]}')
+                else:
+                    self.stdout.write(f'Created book: {book_data["title"]} by {book_data["author"]}')
+        
+        # bulk_create() does not send post_save, so drop the cached stats here
+        invalidate_stats_caches()
         
         self.stdout.write(
             self.style.SUCCESS(
-                f'Successfully populated database with {len(authors)} authors and {len(books_data)} books'
+                f'Successfully populated database with {len(authors_data)} authors and {len(books_data)} books'
             )
         )
-
@@ -0,0 +1,47 @@
+# Generated by Django 5.2.18 on 2026-10-14 15:26
+
+from django.db import migrations, models
+
+
+# Trigram indexes let PostgreSQL serve the icontains lookups used by
+# BookFilter.filter_search and the search endpoints from an index instead of
+# a sequential scan. Django compiles icontains to UPPER(column::text) LIKE
+# UPPER(%s), so the indexes are built on that expression. Other backends have
+# no equivalent, so they are skipped.
+TRIGRAM_INDEXES = [
+    ('api_book_title_upper_trgm', 'api_book', 'title'),
+    ('api_author_name_upper_trgm', 'api_author', 'name'),
+]
+
+
+def create_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    schema_editor.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+    for index_name, table, column in TRIGRAM_INDEXES:
+        schema_editor.execute(
+            f'CREATE INDEX IF NOT EXISTS {index_name} ON {table} USING gin ((UPPER({column}::text)) gin_trgm_ops)'
+        )
+
+
+def drop_trigram_indexes(apps, schema_editor):
+    if schema_editor.connection.vendor != 'postgresql':
+        return
+    for index_name, _table, _column in TRIGRAM_INDEXES:
+        schema_editor.execute(f'DROP INDEX IF EXISTS {index_name}')
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='book',
+            name='title',
+            field=models.CharField(db_index=True, max_length=200),
+        ),
+        migrations.RunPython(create_trigram_indexes, drop_trigram_indexes),
+    ]
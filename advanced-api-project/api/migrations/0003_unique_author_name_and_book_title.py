@@ -0,0 +1,58 @@
+# Generated by Django 5.2.18 on 2026-10-14 15:27
+
+from django.db import migrations, models
+from django.db.models import Count, Min
+
+
+def merge_duplicates(apps, schema_editor):
+    """
+    Collapse rows that would violate the new unique constraints: authors
+    sharing a name are merged into the one with the lowest id (their books are
+    repointed to it), then books repeating a (title, author) pair are reduced
+    to the lowest id.
+    """
+    Author = apps.get_model('api', 'Author')
+    Book = apps.get_model('api', 'Book')
+    db_alias = schema_editor.connection.alias
+
+    duplicate_names = (
+        Author.objects.using(db_alias).values('name')
+        .annotate(keep_id=Min('id'), total=Count('id')).filter(total__gt=1)
+    )
+    for row in duplicate_names:
+        duplicates = Author.objects.using(db_alias).filter(name=row['name']).exclude(id=row['keep_id'])
+        Book.objects.using(db_alias).filter(author__in=duplicates).update(author_id=row['keep_id'])
+        duplicates.delete()
+
+    duplicate_books = (
+        Book.objects.using(db_alias).values('title', 'author_id')
+        .annotate(keep_id=Min('id'), total=Count('id')).filter(total__gt=1)
+    )
+    for row in duplicate_books:
+        Book.objects.using(db_alias).filter(
+            title=row['title'], author_id=row['author_id']
+        ).exclude(id=row['keep_id']).delete()
+
+
+class Migration(migrations.Migration):
+
+    # The data fix runs in its own transaction: on PostgreSQL, altering tables
+    # with pending deferred FK trigger events from it would fail.
+    atomic = False
+
+    dependencies = [
+        ('api', '0002_book_title_indexes'),
+    ]
+
+    operations = [
+        migrations.RunPython(merge_duplicates, migrations.RunPython.noop, atomic=True),
+        migrations.AlterField(
+            model_name='author',
+            name='name',
+            field=models.CharField(max_length=100, unique=True),
+        ),
+        migrations.AddConstraint(
+            model_name='book',
+            constraint=models.UniqueConstraint(fields=('title', 'author'), name='unique_book_title_per_author'),
+        ),
+    ]
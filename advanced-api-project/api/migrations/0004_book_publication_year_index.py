@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-14 15:28
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0003_unique_author_name_and_book_title'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='book',
+            index=models.Index(fields=['publication_year', 'id'], name='api_book_publica_6a5e28_idx'),
+        ),
+    ]
@@ -0,0 +1,17 @@
+# Generated by Django 5.2.18 on 2026-10-14 15:34
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('api', '0004_book_publication_year_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='book',
+            index=models.Index(fields=['author', 'publication_year'], name='api_book_author__e0f153_idx'),
+        ),
+    ]
@@ -2,17 +2,26 @@ from django.db import models
 
 
 class Author(models.Model):
-    name = models.CharField(max_length=100)
+    name = models.CharField(max_length=100, unique=True)
 
     def __str__(self):
         return self.name
 
 
 class Book(models.Model):
-    title = models.CharField(max_length=200)
+    title = models.CharField(max_length=200, db_index=True)
     publication_year = models.IntegerField()
     author = models.ForeignKey(Author, on_delete=models.CASCADE, related_name='books')
 
+    class Meta:
+        constraints = [
+            models.UniqueConstraint(fields=['title', 'author'], name='unique_book_title_per_author'),
+        ]
+        indexes = [
+            models.Index(fields=['publication_year', 'id']),
+            models.Index(fields=['author', 'publication_year']),
+        ]
+
     def __str__(self):
         return self.title
 
@@ -0,0 +1,223 @@
+"""
+Pagination classes for the API list endpoints.
+
+Cursor (keyset) pagination is used instead of the project-wide
+PageNumberPagination so that each page is fetched with a range condition on
+the ordering columns rather than an OFFSET, and without a COUNT(*) query.
+"""
+
+import json
+import operator
+from functools import reduce
+
+from django.core.exceptions import FieldDoesNotExist, ImproperlyConfigured, ValidationError
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import models
+from django.db.models import Q
+from django.db.models.constants import LOOKUP_SEP
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import Cursor, CursorPagination
+
+
+def _reverse_ordering(ordering):
+    """Flip the direction of every column in ``ordering``."""
+    return tuple(field[1:] if field.startswith('-') else '-' + field for field in ordering)
+
+
+class KeysetCursorPagination(CursorPagination):
+    """
+    CursorPagination over a composite key.
+
+    DRF's CursorPagination stores only the first ordering column in the
+    cursor and steps over ties with an offset, which returns the wrong rows
+    when paging backwards across ties. Here the ordering is always extended to
+    a unique key and the cursor stores the value of every column in it, so
+    each page is a plain lexicographic range condition and no offset is ever
+    needed. Related-field orderings such as ``author__name`` from
+    OrderingFilter are supported; nullable columns are not, since NULL has no
+    place in a range condition.
+    """
+    page_size = 50
+
+    def get_ordering(self, request, queryset, view):
+        """
+        Cut the requested ordering off after its first unique column, or
+        append the primary key if it has none, so every row has a distinct
+        position.
+        """
+        ordering = tuple(super().get_ordering(request, queryset, view))
+        for field in ordering:
+            if self._is_nullable(queryset.model, field.lstrip('-')):
+                raise ImproperlyConfigured(
+                    f'{type(self).__name__} cannot order by the nullable field {field.lstrip("-")!r}.'
+                )
+        for index, field in enumerate(ordering):
+            if self._is_unique(queryset.model, field.lstrip('-')):
+                return ordering[:index + 1]
+        tiebreaker = '-id' if ordering[0].startswith('-') else 'id'
+        return ordering + (tiebreaker,)
+
+    @staticmethod
+    def _is_unique(model, field_name):
+        if field_name in ('pk', 'id'):
+            return True
+        if LOOKUP_SEP in field_name:
+            return False
+        try:
+            return model._meta.get_field(field_name).unique
+        except FieldDoesNotExist:
+            return False
+
+    @staticmethod
+    def _is_nullable(model, field_name):
+        """
+        Whether any column on the path to ``field_name`` allows NULL.
+        Names that are not model fields (annotations) are taken to be non-null.
+        """
+        if field_name == 'pk':
+            return False
+        for part in field_name.split(LOOKUP_SEP):
+            try:
+                field = model._meta.get_field(part)
+            except FieldDoesNotExist:
+                return False
+            if field.null:
+                return True
+            model = field.related_model
+            if model is None:
+                break
+        return False
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        if not self.page_size:
+            return None
+
+        self.base_url = request.build_absolute_uri()
+        self.ordering = self.get_ordering(request, queryset, view)
+
+        self.cursor = self.decode_cursor(request)
+        if self.cursor is None:
+            reverse, current_position = False, None
+        else:
+            reverse, current_position = self.cursor.reverse, self.cursor.position
+
+        if reverse:
+            queryset = queryset.order_by(*_reverse_ordering(self.ordering))
+        else:
+            queryset = queryset.order_by(*self.ordering)
+
+        try:
+            if current_position is not None:
+                queryset = queryset.filter(self._after_position(current_position, reverse))
+            # Fetch one extra row to find out whether another page follows.
+            results = list(queryset[:self.page_size + 1])
+        except (ValueError, ValidationError):
+            # A tampered cursor value the column cannot hold, e.g. a year of 'x'
+            raise NotFound(self.invalid_cursor_message)
+        self.page = results[:self.page_size]
+        has_following_position = len(results) > len(self.page)
+        following_position = (
+            self._get_position_from_instance(self.page[-1], self.ordering) if has_following_position else None
+        )
+
+        if reverse:
+            self.page.reverse()
+            self.has_next = current_position is not None
+            self.has_previous = has_following_position
+            self.next_position = current_position
+            self.previous_position = following_position
+        else:
+            self.has_next = has_following_position
+            self.has_previous = current_position is not None
+            self.next_position = following_position
+            self.previous_position = current_position
+
+        if (self.has_previous or self.has_next) and self.template is not None:
+            self.display_page_controls = True
+
+        return self.page
+
+    def get_next_link(self):
+        if not self.has_next:
+            return None
+        position = self.next_position
+        if self.page and self.cursor and self.cursor.reverse:
+            position = self._get_position_from_instance(self.page[-1], self.ordering)
+        return self.encode_cursor(Cursor(offset=0, reverse=False, position=position))
+
+    def get_previous_link(self):
+        if not self.has_previous:
+            return None
+        position = self.previous_position
+        if self.page and not (self.cursor and self.cursor.reverse):
+            position = self._get_position_from_instance(self.page[0], self.ordering)
+        return self.encode_cursor(Cursor(offset=0, reverse=True, position=position))
+
+    def _after_position(self, position, reverse):
+        """
+        Rows strictly after ``position`` in the (possibly reversed) ordering:
+        (a > x) OR (a = x AND b > y) OR ..., with < for descending columns.
+        """
+        try:
+            values = json.loads(position)
+        except ValueError:
+            values = None
+        if (
+            not isinstance(values, list)
+            or len(values) != len(self.ordering)
+            or any(value is None or isinstance(value, (list, dict)) for value in values)
+        ):
+            raise NotFound(self.invalid_cursor_message)
+
+        conditions = []
+        equal = Q()
+        for field, value in zip(self.ordering, values):
+            descending = field.startswith('-') != reverse
+            name = field.lstrip('-')
+            conditions.append(equal & Q(**{f"{name}__{'lt' if descending else 'gt'}": value}))
+            equal &= Q(**{name: value})
+        return reduce(operator.or_, conditions)
+
+    def _get_position_from_instance(self, instance, ordering):
+        # Values keep their JSON types (a year stays an int); dates, decimals
+        # and UUIDs become strings that the lookups convert back.
+        return json.dumps(
+            [self._get_value(instance, field.lstrip('-')) for field in ordering], cls=DjangoJSONEncoder
+        )
+
+    @staticmethod
+    def _get_value(instance, field_name):
+        if isinstance(instance, dict):
+            return instance[field_name]
+        attr = instance
+        for part in field_name.split(LOOKUP_SEP):
+            attr = getattr(attr, part)
+        if isinstance(attr, models.Model):
+            attr = attr.pk
+        return attr
+
+
+class BookCursorPagination(KeysetCursorPagination):
+    """
+    Newest books first; backed by the (publication_year, id) index on Book.
+    """
+    ordering = ('-publication_year', '-id')
+
+
+class BookSearchCursorPagination(BookCursorPagination):
+    """
+    Book search results: 20 per page by default, adjustable with ?limit=
+    up to 100.
+    """
+    page_size = 20
+    page_size_query_param = 'limit'
+    max_page_size = 100
+
+
+class AuthorCursorPagination(KeysetCursorPagination):
+    """
+    Authors alphabetically; backed by the unique index on Author.name.
+    """
+    ordering = ('name', 'id')
@@ -0,0 +1,54 @@
+"""
+JSON renderer and parser backed by orjson.
+
+orjson encodes and decodes in C, which is noticeably cheaper than the stdlib
+json module used by DRF's JSONRenderer/JSONParser for the larger list and
+stats payloads. Types orjson does not know natively (lazy translation
+strings, Decimal, querysets, ...) fall back to DRF's own JSON encoder.
+
+orjson has fewer output knobs than the stdlib encoder: output is always
+UTF-8 and compact, non-finite floats are written as null, and indentation
+is fixed at two spaces. DRF's UNICODE_JSON, COMPACT_JSON and STRICT_JSON
+settings therefore have no effect on these classes.
+"""
+
+import orjson
+from rest_framework.exceptions import ParseError
+from rest_framework.parsers import JSONParser
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+_default_encoder = JSONEncoder()
+
+
+class ORJSONRenderer(JSONRenderer):
+    """
+    Renders `data` into JSON with orjson. Any ``indent`` media type parameter
+    (or renderer context value) selects orjson's two-space indentation,
+    whatever width was asked for.
+    """
+    options = orjson.OPT_NON_STR_KEYS
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+
+        options = self.options
+        renderer_context = renderer_context or {}
+        if self.get_indent(accepted_media_type, renderer_context):
+            options |= orjson.OPT_INDENT_2
+
+        return orjson.dumps(data, default=_default_encoder.default, option=options)
+
+
+class ORJSONParser(JSONParser):
+    """
+    Parses JSON-serialized request bodies with orjson.
+    """
+    renderer_class = ORJSONRenderer
+
+    def parse(self, stream, media_type=None, parser_context=None):
+        try:
+            return orjson.loads(stream.read())
+        except orjson.JSONDecodeError as exc:
+            raise ParseError('JSON parse error - %s' % str(exc))
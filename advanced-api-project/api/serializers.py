@@ -6,7 +6,7 @@ from datetime import datetime
 class BookSerializer(serializers.ModelSerializer):
     class Meta:
         model = Book
-        fields = '__all__'
+        fields = ['id', 'title', 'publication_year', 'author']
 
     def validate_publication_year(self, value):
         """
@@ -18,9 +18,30 @@ class BookSerializer(serializers.ModelSerializer):
         return value
 
 
-class AuthorSerializer(serializers.ModelSerializer):
-    books = BookSerializer(many=True, read_only=True)
+class AuthorSummarySerializer(serializers.ModelSerializer):
+    """
+    Author with its annotated book count but without the nested books.
+    """
+    books_count = serializers.IntegerField(read_only=True)
 
     class Meta:
         model = Author
-        fields = ['name', 'books']
\ No newline at end of file
+        fields = ['name', 'books_count']
+
+
+class AuthorSerializer(AuthorSummarySerializer):
+    books = BookSerializer(many=True, read_only=True)
+
+    class Meta(AuthorSummarySerializer.Meta):
+        fields = ['name', 'books_count', 'books']
+
+
+AUTHOR_ANALYTICS_SORT_OPTIONS = ('name', 'book_count', 'latest_book')
+
+
+class AuthorAnalyticsParamsSerializer(serializers.Serializer):
+    """
+    Validates and types the author_analytics query parameters.
+    """
+    min_books = serializers.IntegerField(min_value=0, default=1)
+    sort_by = serializers.ChoiceField(choices=AUTHOR_ANALYTICS_SORT_OPTIONS, default='name')
@@ -0,0 +1,15 @@
+"""
+Signal handlers that keep cached API data in step with the database.
+"""
+
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from .cache import invalidate_stats_caches
+from .models import Author, Book
+
+
+@receiver([post_save, post_delete], sender=Book)
+@receiver([post_save, post_delete], sender=Author)
+def invalidate_cached_stats(sender, **kwargs):
+    """Invalidate cached statistics whenever a book or author is written."""
+    invalidate_stats_caches()
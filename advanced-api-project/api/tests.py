@@ -1,3 +1,297 @@
+import json
+from base64 import b64decode, b64encode
+from unittest import mock
+from urllib.parse import parse_qs, urlencode, urlparse
+
+from django.contrib.auth.models import User
+from django.core.cache import cache
+from django.db import connection
+from django.db.models import F
 from django.test import TestCase
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+from rest_framework.test import APIClient
+
+from .filters import MAX_IN_FILTER_VALUES, AnyArray
+from .pagination import BookCursorPagination
+from .models import Author, Book
+
+
+class APITestCase(TestCase):
+    """
+    Base class for the API tests: a few authors with books, an API client and
+    an empty cache, so page-cached and low-level cached responses from one
+    test never leak into the next.
+    """
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.authors = [Author.objects.create(name=f'Author {i}') for i in range(3)]
+        for author in cls.authors:
+            for year in range(1990, 1994):
+                Book.objects.create(title=f'{author.name} {year}', publication_year=year, author=author)
+
+    def setUp(self):
+        cache.clear()
+        self.addCleanup(cache.clear)
+        self.client = APIClient()
+
+
+class BookQueryCountTests(APITestCase):
+    """
+    The book read endpoints load authors with select_related, so the number of
+    queries does not grow with the number of books rendered.
+    """
+
+    def test_book_list_is_a_single_query(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('book-list'))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), 12)
+
+    def test_book_detail_is_a_single_query(self):
+        book = Book.objects.first()
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('book-detail', args=[book.pk]))
+        self.assertEqual(response.status_code, 200)
+
+    def test_combined_views_are_a_single_query(self):
+        book = Book.objects.first()
+        with self.assertNumQueries(1):
+            self.client.get(reverse('book-list-create'))
+        with self.assertNumQueries(1):
+            self.client.get(reverse('book-retrieve-update-destroy', args=[book.pk]))
+
+
+class BookProjectionTests(APITestCase):
+    """
+    Book list querysets are projected with only(); the serializer must not
+    touch a deferred column, or every row would cost an extra query.
+    """
+
+    def test_book_list_selects_only_rendered_columns(self):
+        with CaptureQueriesContext(connection) as queries:
+            response = self.client.get(reverse('book-list'))
+        self.assertEqual(len(queries), 1)
+        sql = queries[0]['sql']
+        columns = sql[len('SELECT '):sql.index(' FROM ')].split(', ')
+        self.assertEqual(columns, [
+            '"api_book"."id"', '"api_book"."title"', '"api_book"."publication_year"',
+            '"api_book"."author_id"', '"api_author"."id"', '"api_author"."name"',
+        ])
+        self.assertEqual(set(response.data['results'][0]), {'id', 'title', 'publication_year', 'author'})
+
+    def test_search_results_do_not_load_deferred_fields(self):
+        with self.assertNumQueries(1):
+            response = self.client.get(reverse('book-search'), {'q': 'Author'})
+        self.assertEqual(len(response.data['results']), 12)
+
+
+class BookETagTests(APITestCase):
+    """
+    Writes through the API must change the ETags of the read views, so a
+    client revalidating a stale copy is sent the new one.
+    """
+
+    def setUp(self):
+        super().setUp()
+        self.book = Book.objects.first()
+        self.writer = APIClient()
+        self.writer.force_authenticate(User.objects.create_user('writer', password='secret'))
+
+    def assert_update_changes_etags(self, url):
+        detail_url = reverse('book-detail', args=[self.book.pk])
+        author_url = reverse('author-detail', args=[self.book.author_id])
+        book_etag = self.client.get(detail_url)['ETag']
+        author_etag = self.client.get(author_url)['ETag']
+        self.assertEqual(self.client.get(detail_url, HTTP_IF_NONE_MATCH=book_etag).status_code, 304)
+
+        response = self.writer.patch(url, {'title': 'Renamed'}, format='json')
+
+        self.assertEqual(response.status_code, 200)
+        for read_url, old_etag in ((detail_url, book_etag), (author_url, author_etag)):
+            with self.subTest(url=read_url):
+                response = self.client.get(read_url, HTTP_IF_NONE_MATCH=old_etag)
+                self.assertEqual(response.status_code, 200)
+                self.assertNotEqual(response['ETag'], old_etag)
+                new_etag = response['ETag']
+                self.assertEqual(self.client.get(read_url, HTTP_IF_NONE_MATCH=new_etag).status_code, 304)
+        self.assertEqual(self.client.get(detail_url).data['title'], 'Renamed')
+        self.assertIn('Renamed', [book['title'] for book in self.client.get(author_url).data['books']])
+
+    def test_update_view_changes_etags(self):
+        self.assert_update_changes_etags(reverse('book-update', args=[self.book.pk]))
+
+    def test_combined_view_changes_etags(self):
+        self.assert_update_changes_etags(reverse('book-retrieve-update-destroy', args=[self.book.pk]))
+
+    def test_unchanged_list_is_not_modified_without_queries(self):
+        etag = self.client.get(reverse('book-list'))['ETag']
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('book-list'), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(response.status_code, 304)
+
+
+class BookStatsCacheTests(APITestCase):
+    """book_stats is served from the cache and recomputed after any write."""
+
+    def test_stats_are_cached(self):
+        self.client.get(reverse('book-stats'))
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('book-stats'))
+        self.assertEqual(response.data['total_books'], 12)
+
+    def test_book_write_invalidates_stats(self):
+        self.client.get(reverse('book-stats'))
+        Book.objects.create(title='New', publication_year=2000, author=self.authors[0])
+        self.assertEqual(self.client.get(reverse('book-stats')).data['total_books'], 13)
+        Book.objects.filter(title='New').get().delete()
+        self.assertEqual(self.client.get(reverse('book-stats')).data['total_books'], 12)
+
+    def test_author_write_invalidates_stats(self):
+        self.client.get(reverse('book-stats'))
+        Author.objects.create(name='New Author')
+        self.assertEqual(self.client.get(reverse('book-stats')).data['total_authors'], 4)
+
+
+class AuthorAnalyticsCacheTests(APITestCase):
+    """
+    author_analytics caches each (min_books, sort_by) combination and retires
+    all of them on any write.
+    """
+
+    def test_analytics_are_cached_per_parameters(self):
+        self.client.get(reverse('author-analytics'), {'min_books': 4})
+        with self.assertNumQueries(0):
+            response = self.client.get(reverse('author-analytics'), {'min_books': 4})
+        self.assertEqual(response.data['total_authors'], 3)
+        response = self.client.get(reverse('author-analytics'), {'min_books': 5})
+        self.assertEqual(response.data['total_authors'], 0)
+
+    def test_book_write_invalidates_every_combination(self):
+        self.client.get(reverse('author-analytics'), {'min_books': 5})
+        self.client.get(reverse('author-analytics'), {'min_books': 5, 'sort_by': 'book_count'})
+        Book.objects.create(title='New', publication_year=2000, author=self.authors[0])
+        for params in ({'min_books': 5}, {'min_books': 5, 'sort_by': 'book_count'}):
+            response = self.client.get(reverse('author-analytics'), params)
+            self.assertEqual(response.data['total_authors'], 1)
+            self.assertEqual(len(response.data['authors'][0]['books']), 5)
+
+
+class BookIdInFilterTests(APITestCase):
+    """id__in accepts up to MAX_IN_FILTER_VALUES integer ids."""
+
+    def get_ids(self, value):
+        return self.client.get(reverse('book-list'), {'id__in': value})
+
+    def test_filters_by_ids(self):
+        ids = sorted(Book.objects.values_list('id', flat=True)[:3])
+        response = self.get_ids(','.join(map(str, ids)))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(sorted(book['id'] for book in response.data['results']), ids)
+
+    def test_accepts_the_maximum_number_of_ids(self):
+        response = self.get_ids(','.join(map(str, range(1, MAX_IN_FILTER_VALUES + 1))))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(len(response.data['results']), 12)
+
+    def test_rejects_too_many_ids(self):
+        response = self.get_ids(','.join(map(str, range(1, MAX_IN_FILTER_VALUES + 2))))
+        self.assertEqual(response.status_code, 400)
+        self.assertIn('id__in', response.data)
+
+    def test_rejects_non_integer_ids(self):
+        self.assertEqual(self.get_ids('1,two').status_code, 400)
+
+
+@mock.patch.object(BookCursorPagination, 'page_size', 5)
+class BookCursorPaginationTests(APITestCase):
+    """
+    Paging forwards and then backwards must visit every book exactly once and
+    give back the same pages, including for orderings on non-unique columns
+    whose ties straddle page boundaries.
+    """
+
+    def walk(self, url, direction):
+        pages = []
+        while url:
+            data = self.client.get(url).data
+            pages.append(data)
+            url = data[direction]
+        return pages
+
+    @staticmethod
+    def ids(page):
+        return [book['id'] for book in page['results']]
+
+    def assert_pages_round_trip(self, ordering):
+        forward = self.walk(f"{reverse('book-list')}?ordering={ordering}", 'next')
+        forward_ids = [book_id for page in forward for book_id in self.ids(page)]
+        self.assertEqual(sorted(forward_ids), sorted(Book.objects.values_list('id', flat=True)))
+
+        # next followed by previous lands on the page we started from
+        for page in forward[:-1]:
+            following = self.client.get(page['next']).data
+            self.assertEqual(self.ids(self.client.get(following['previous']).data), self.ids(page))
+
+        # walking back from the last page visits the same books in reverse
+        backward = self.walk(forward[-1]['previous'], 'previous')
+        backward_ids = [book_id for page in reversed(backward) for book_id in self.ids(page)]
+        self.assertEqual(backward_ids + self.ids(forward[-1]), forward_ids)
+
+    def test_default_ordering(self):
+        self.assert_pages_round_trip('-publication_year')
+
+    def test_non_unique_orderings(self):
+        for ordering in ('author__name', '-author__name', 'publication_year', 'author'):
+            with self.subTest(ordering=ordering):
+                self.assert_pages_round_trip(ordering)
+
+    def test_cursor_keeps_native_json_values(self):
+        next_link = self.client.get(reverse('book-list')).data['next']
+        cursor = parse_qs(urlparse(next_link).query)['cursor'][0]
+        position = json.loads(parse_qs(b64decode(cursor).decode())['p'][0])
+        self.assertTrue(all(isinstance(value, int) for value in position))
+
+    def test_rejects_tampered_cursor_values(self):
+        for position in ([None, 1], ['not a year', 1], [1990]):
+            with self.subTest(position=position):
+                cursor = b64encode(urlencode({'p': json.dumps(position)}).encode()).decode()
+                response = self.client.get(reverse('book-list'), {'cursor': cursor})
+                self.assertEqual(response.status_code, 404)
+
+
+class ORJSONRendererParserTests(APITestCase):
+    """The orjson renderer and parser behave like DRF's JSON ones."""
+
+    def setUp(self):
+        super().setUp()
+        self.client.force_authenticate(User.objects.create_user('writer', password='secret'))
+
+    def test_round_trips_unicode(self):
+        response = self.client.post(
+            reverse('book-list'),
+            data='{"title": "Über", "publication_year": 2000, "author": %d}' % self.authors[0].pk,
+            content_type='application/json',
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()['title'], 'Über')
+
+    def test_malformed_body_is_a_parse_error(self):
+        response = self.client.post(reverse('book-list'), data='{bad', content_type='application/json')
+        self.assertEqual(response.status_code, 400)
+        self.assertTrue(response.json()['detail'].startswith('JSON parse error'))
+
+    def test_indent_media_type_parameter(self):
+        response = self.client.get(reverse('book-stats'), HTTP_ACCEPT='application/json; indent=2')
+        self.assertTrue(response.content.startswith(b'{\n  "'))
+
+
+class AnyArrayLookupTests(TestCase):
+    """AnyArray binds the whole id list as one parameter."""
 
-# Create your tests here.
+    def test_sql_binds_a_single_array_parameter(self):
+        for ids in ([1], [1, 2, 3]):
+            sql, params = Book.objects.filter(AnyArray(F('id'), ids)).query.sql_with_params()
+            self.assertIn('"api_book"."id" = ANY(%s::', sql)
+            self.assertEqual(params, (ids,))
@@ -15,8 +15,9 @@ router = DefaultRouter()
 # URL patterns for individual views
 urlpatterns = [
     # Book CRUD endpoints - Individual views following RESTful conventions
-    path('books/', views.BookListView.as_view(), name='book-list'),
+    path('books/', views.BookListCreateView.as_view(), name='book-list'),
     path('books/<int:pk>/', views.BookDetailView.as_view(), name='book-detail'),
+    path('books/count/', views.book_count, name='book-count'),
     path('books/create/', views.BookCreateView.as_view(), name='book-create'),
     path('books/update/<int:pk>/', views.BookUpdateView.as_view(), name='book-update'),
     path('books/delete/<int:pk>/', views.BookDeleteView.as_view(), name='book-delete'),
@@ -31,7 +32,7 @@ urlpatterns = [
     
     # Custom endpoints
     path('stats/', views.book_stats, name='book-stats'),
-    path('search/', views.book_search, name='book-search'),
+    path('search/', views.BookSearchView.as_view(), name='book-search'),
     path('authors/analytics/', views.author_analytics, name='author-analytics'),
     
     # Include router URLs (for future ViewSets)
@@ -1,18 +1,58 @@
-from rest_framework import generics, status, permissions
-from rest_framework.permissions import IsAuthenticatedOrReadOnly, IsAuthenticated
+from rest_framework import generics
+from rest_framework.permissions import IsAuthenticatedOrReadOnly, IsAuthenticated, AllowAny
 from rest_framework.decorators import api_view, permission_classes
 from rest_framework.response import Response
 from django_filters.rest_framework import DjangoFilterBackend
 from rest_framework.filters import SearchFilter, OrderingFilter
-from django.db.models import Count, Q, Max
+from django.core.cache import cache
+from django.utils.decorators import method_decorator
+from django.views.decorators.cache import cache_control
+from django.views.decorators.http import condition
+from django.views.decorators.vary import vary_on_headers
+from django.db import connection
+from django.db.models import Count, Max, Prefetch, Q
+from django.db.models.functions import JSONObject
 from .models import Book, Author
-from .serializers import BookSerializer, AuthorSerializer
-from .filters import BookFilter, AuthorFilter
+from .serializers import BookSerializer, AuthorSerializer, AuthorSummarySerializer, AuthorAnalyticsParamsSerializer
+from .filters import BookFilter, BookSearchFilter, AuthorFilter
+from .pagination import BookCursorPagination, BookSearchCursorPagination, AuthorCursorPagination
+from .cache import (
+    BOOK_STATS_CACHE_KEY,
+    BOOK_STATS_CACHE_TIMEOUT,
+    BOOK_COUNT_CACHE_KEY,
+    AUTHOR_ANALYTICS_CACHE_TIMEOUT,
+    HTTP_CACHE_MAX_AGE,
+    author_analytics_cache_key,
+    read_view_etag,
+    versioned_cache_page,
+)
 
 
-class BookListView(generics.ListAPIView):
+# Columns rendered by BookSerializer; read querysets are projected onto these
+BOOK_READ_FIELDS = ('id', 'title', 'publication_year', 'author_id', 'author__name')
+
+
+def nested_books_prefetch():
+    """
+    Prefetch an author's books with only the columns the nested BookSerializer
+    renders; author_id is needed to attach each book to its author.
+    """
+    return Prefetch('books', queryset=Book.objects.only('id', 'title', 'publication_year', 'author_id'))
+
+# Server-side page cache for the public read views. Entries are keyed per URL,
+# per the Accept, Cookie and Authorization headers and per data version, so a
+# book or author write retires them; otherwise they expire after
+# HTTP_CACHE_MAX_AGE seconds. Conditional GET checks are applied outside this
+# cache so a 304 is never stored.
+PUBLIC_PAGE_CACHE = [versioned_cache_page(HTTP_CACHE_MAX_AGE), vary_on_headers('Authorization')]
+
+
+@method_decorator(cache_control(public=True, max_age=HTTP_CACHE_MAX_AGE), name='get')
+@method_decorator([condition(etag_func=read_view_etag), *PUBLIC_PAGE_CACHE], name='dispatch')
+class BookListCreateView(generics.ListCreateAPIView):
     """
-    Enhanced ListView for retrieving all books with comprehensive filtering, searching, and ordering capabilities.
+    Combined ListView and CreateView for books with comprehensive filtering, searching, and ordering capabilities.
+    Listing is open to everyone; creating a book (POST) requires authentication.
     
     Filtering Options:
     - title: Filter by book title (partial match)
@@ -28,7 +68,7 @@ class BookListView(generics.ListAPIView):
     - publication_year__lt: Filter by publication year < value
     - publication_year_range_min/max: Filter by publication year range
     - id: Filter by book ID
-    - id__in: Filter by multiple book IDs (comma-separated)
+    - id__in: Filter by multiple book IDs (comma-separated, at most 1000)
     - search: Search in both title and author name
     
     Search Fields:
@@ -41,36 +81,39 @@ class BookListView(generics.ListAPIView):
     - author__name, -author__name: Order by author name
     - id, -id: Order by book ID
     
+    Results are cursor-paginated (50 per page, newest first by default);
+    follow the "next"/"previous" links to page through them.
+    GET responses carry an ETag, so clients can revalidate with
+    If-None-Match and get a 304 while no book or author has changed. Full GET
+    responses are also cached server-side per URL (and Accept/Authorization/
+    Cookie) until the next write or for HTTP_CACHE_MAX_AGE seconds.
+    
     Example Usage:
     - GET /api/books/?title=Harry&publication_year__gte=1990&ordering=-publication_year
     - GET /api/books/?search=Potter&author__name=Rowling
     - GET /api/books/?publication_year_range_min=1900&publication_year_range_max=2000
     """
-    queryset = Book.objects.select_related('author').all()
+    queryset = Book.objects.select_related('author').only(*BOOK_READ_FIELDS)
     serializer_class = BookSerializer
-    permission_classes = [permissions.AllowAny]  # Allow unauthenticated read access
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
+    filter_backends = (DjangoFilterBackend, SearchFilter, OrderingFilter)
     filterset_class = BookFilter  # Use custom filter class instead of filterset_fields
-    search_fields = ['title', 'author__name', 'author__name__icontains']
-    ordering_fields = ['title', 'publication_year', 'author__name', 'id', 'author']
-    ordering = ['title']  # Default ordering
-    
-    def get_queryset(self):
-        """
-        Enhance the queryset with additional annotations for advanced filtering.
-        """
-        queryset = super().get_queryset()
-        return queryset.select_related('author').prefetch_related('author__books')
+    search_fields = ('title', 'author__name')
+    ordering_fields = ('title', 'publication_year', 'author__name', 'id', 'author')
+    ordering = ('-publication_year', '-id')  # Default ordering, matches BookCursorPagination
+    pagination_class = BookCursorPagination
+    permission_classes = [IsAuthenticatedOrReadOnly]  # Public reads, authenticated writes
 
 
+@method_decorator(cache_control(public=True, max_age=HTTP_CACHE_MAX_AGE), name='get')
+@method_decorator([condition(etag_func=read_view_etag), *PUBLIC_PAGE_CACHE], name='dispatch')
 class BookDetailView(generics.RetrieveAPIView):
     """
     DetailView for retrieving a single book by ID.
     Provides read-only access to individual Book instances.
     """
-    queryset = Book.objects.all()
+    queryset = Book.objects.select_related('author').only(*BOOK_READ_FIELDS)
     serializer_class = BookSerializer
-    permission_classes = [permissions.AllowAny]  # Allow unauthenticated read access
+    permission_classes = [AllowAny]  # Allow unauthenticated read access
 
 
 class BookCreateView(generics.CreateAPIView):
@@ -78,7 +121,7 @@ class BookCreateView(generics.CreateAPIView):
     CreateView for adding a new book.
     Restricted to authenticated users only.
     """
-    queryset = Book.objects.all()
+    queryset = Book.objects.none()  # Only used for the model; never evaluated
     serializer_class = BookSerializer
     permission_classes = [IsAuthenticated]
 
@@ -96,19 +139,12 @@ class BookCreateView(generics.CreateAPIView):
     def create(self, request, *args, **kwargs):
         """
         Override create method to customize the response.
+        The body is the created book; the success message is sent in the
+        X-Message header.
         """
-        serializer = self.get_serializer(data=request.data)
-        serializer.is_valid(raise_exception=True)
-        self.perform_create(serializer)
-        headers = self.get_success_headers(serializer.data)
-        return Response(
-            {
-                'message': 'Book created successfully',
-                'data': serializer.data
-            },
-            status=status.HTTP_201_CREATED,
-            headers=headers
-        )
+        response = super().create(request, *args, **kwargs)
+        response['X-Message'] = 'Book created successfully'
+        return response
 
 
 class BookUpdateView(generics.UpdateAPIView):
@@ -117,7 +153,7 @@ class BookUpdateView(generics.UpdateAPIView):
     Supports both PUT (full update) and PATCH (partial update).
     Restricted to authenticated users only.
     """
-    queryset = Book.objects.all()
+    queryset = Book.objects.select_related('author').only(*BOOK_READ_FIELDS)
     serializer_class = BookSerializer
     permission_classes = [IsAuthenticated]
 
@@ -135,22 +171,12 @@ class BookUpdateView(generics.UpdateAPIView):
     def update(self, request, *args, **kwargs):
         """
         Override update method to customize the response.
+        The fetch/validate/save pipeline is left to UpdateAPIView; the body is
+        the updated book and the success message is sent in the X-Message header.
         """
-        partial = kwargs.pop('partial', False)
-        instance = self.get_object()
-        serializer = self.get_serializer(instance, data=request.data, partial=partial)
-        serializer.is_valid(raise_exception=True)
-        self.perform_update(serializer)
-        
-        if getattr(instance, '_prefetched_objects_cache', None):
-            instance._prefetched_objects_cache = {}
-            
-        return Response(
-            {
-                'message': 'Book updated successfully',
-                'data': serializer.data
-            }
-        )
+        response = super().update(request, *args, **kwargs)
+        response['X-Message'] = 'Book updated successfully'
+        return response
 
 
 class BookDeleteView(generics.DestroyAPIView):
@@ -158,7 +184,7 @@ class BookDeleteView(generics.DestroyAPIView):
     DeleteView for removing a book.
     Restricted to authenticated users only.
     """
-    queryset = Book.objects.all()
+    queryset = Book.objects.only('id', 'title')  # The title is echoed in the response
     serializer_class = BookSerializer
     permission_classes = [IsAuthenticated]
 
@@ -171,45 +197,18 @@ class BookDeleteView(generics.DestroyAPIView):
         # - Logging the deletion
         # - Soft delete implementation
         # - Sending notifications
+        self.deleted_book_title = instance.title  # Store title for response
         instance.delete()
 
     def destroy(self, request, *args, **kwargs):
         """
         Override destroy method to customize the response.
+        The fetch and delete are left to DestroyAPIView; the 204 response has
+        no body and the confirmation message is sent in the X-Message header.
         """
-        instance = self.get_object()
-        book_title = instance.title  # Store title for response
-        self.perform_destroy(instance)
-        return Response(
-            {
-                'message': f'Book "{book_title}" deleted successfully'
-            },
-            status=status.HTTP_204_NO_CONTENT
-        )
-
-
-class BookListCreateView(generics.ListCreateAPIView):
-    """
-    Combined ListView and CreateView for books with enhanced filtering capabilities.
-    Provides both listing and creation functionality in a single endpoint.
-    
-    Supports all the same filtering, searching, and ordering options as BookListView.
-    """
-    queryset = Book.objects.select_related('author').all()
-    serializer_class = BookSerializer
-    permission_classes = [IsAuthenticatedOrReadOnly]
-    filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
-    filterset_class = BookFilter  # Use custom filter class
-    search_fields = ['title', 'author__name', 'author__name__icontains']
-    ordering_fields = ['title', 'publication_year', 'author__name', 'id', 'author']
-    ordering = ['title']
-    
-    def get_queryset(self):
-        """
-        Enhance the queryset with additional annotations for advanced filtering.
-        """
-        queryset = super().get_queryset()
-        return queryset.select_related('author').prefetch_related('author__books')
+        response = super().destroy(request, *args, **kwargs)
+        response['X-Message'] = f'Book "{self.deleted_book_title}" deleted successfully'
+        return response
 
 
 class BookRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
@@ -217,15 +216,20 @@ class BookRetrieveUpdateDestroyView(generics.RetrieveUpdateDestroyAPIView):
     Combined DetailView, UpdateView, and DeleteView for individual books.
     Provides retrieve, update, and delete functionality in a single endpoint.
     """
-    queryset = Book.objects.all()
+    queryset = Book.objects.select_related('author').only(*BOOK_READ_FIELDS)
     serializer_class = BookSerializer
     permission_classes = [IsAuthenticatedOrReadOnly]
 
 
 # Additional views for demonstration purposes
+@method_decorator(cache_control(public=True, max_age=HTTP_CACHE_MAX_AGE), name='get')
+@method_decorator([condition(etag_func=read_view_etag), *PUBLIC_PAGE_CACHE], name='dispatch')
 class AuthorListView(generics.ListAPIView):
     """
-    Enhanced ListView for retrieving all authors with their books.
+    Enhanced ListView for retrieving all authors with their book counts.
+    
+    The nested book list is only included with ?include=books, so the
+    default listing is a single grouped query without a books prefetch.
     
     Filtering Options:
     - name: Filter by author name (partial match)
@@ -242,45 +246,68 @@ class AuthorListView(generics.ListAPIView):
     - name, -name: Order by author name (ascending/descending)
     - id, -id: Order by author ID
     
+    Results are cursor-paginated (50 per page, alphabetical by default).
+    
     Example Usage:
     - GET /api/authors/?name=Orwell&books_count__gte=2
     - GET /api/authors/?search=Rowling
+    - GET /api/authors/?include=books
     """
-    queryset = Author.objects.annotate(books_count=Count('books')).all()
-    serializer_class = AuthorSerializer
-    permission_classes = [permissions.AllowAny]
+    queryset = Author.objects.annotate(books_count=Count('books')).only('id', 'name')
+    serializer_class = AuthorSummarySerializer
+    permission_classes = [AllowAny]
     filter_backends = [DjangoFilterBackend, SearchFilter, OrderingFilter]
     filterset_class = AuthorFilter  # Use custom filter class
     search_fields = ['name']
     ordering_fields = ['name', 'id', 'books_count']
-    ordering = ['name']
+    ordering = ['name', 'id']
+    pagination_class = AuthorCursorPagination
+    
+    def include_books(self):
+        """
+        Whether the client asked for nested books with ?include=books.
+        """
+        return 'books' in self.request.query_params.get('include', '').split(',')
+    
+    def get_serializer_class(self):
+        if self.include_books():
+            return AuthorSerializer
+        return super().get_serializer_class()
     
     def get_queryset(self):
         """
-        Enhance the queryset with book count annotations.
+        Prefetch the nested books when they were requested. The book count
+        annotation already comes from the class-level queryset.
         """
         queryset = super().get_queryset()
-        return queryset.annotate(books_count=Count('books')).prefetch_related('books')
+        if self.include_books():
+            queryset = queryset.prefetch_related(nested_books_prefetch())
+        return queryset
 
 
+@method_decorator(cache_control(public=True, max_age=HTTP_CACHE_MAX_AGE), name='get')
+@method_decorator([condition(etag_func=read_view_etag), *PUBLIC_PAGE_CACHE], name='dispatch')
 class AuthorDetailView(generics.RetrieveAPIView):
     """
     DetailView for retrieving a single author with their books.
     """
-    queryset = Author.objects.all()
+    queryset = Author.objects.annotate(books_count=Count('books')).only('id', 'name').prefetch_related(
+        nested_books_prefetch()
+    )
     serializer_class = AuthorSerializer
-    permission_classes = [permissions.AllowAny]
+    permission_classes = [AllowAny]
 
 
 # Custom API endpoints for demonstration
-@api_view(['GET'])
-@permission_classes([permissions.AllowAny])
-def book_stats(request):
+def _compute_book_stats():
     """
-    Custom endpoint to get comprehensive statistics about books.
+    Build the book_stats payload. Both totals come from a single aggregate
+    query over authors joined to their books.
     """
-    total_books = Book.objects.count()
-    total_authors = Author.objects.count()
+    totals = Author.objects.aggregate(
+        total_authors=Count('id', distinct=True),
+        total_books=Count('books')
+    )
     
     # Get books by publication year
     books_by_year = Book.objects.values('publication_year').annotate(
@@ -292,22 +319,49 @@ def book_stats(request):
         book_count=Count('books')
     ).values('name', 'book_count').order_by('-book_count')[:5]
     
-    # Get recent books
-    recent_books = Book.objects.select_related('author').order_by('-publication_year')[:5]
-    recent_books_data = BookSerializer(recent_books, many=True).data
+    # Get recent books as plain dicts with the same keys BookSerializer renders
+    recent_books_data = list(
+        Book.objects.values('id', 'title', 'publication_year', 'author').order_by('-publication_year')[:5]
+    )
     
-    return Response({
-        'total_books': total_books,
-        'total_authors': total_authors,
+    return {
+        'total_books': totals['total_books'],
+        'total_authors': totals['total_authors'],
         'recent_books_by_year': list(books_by_year),
         'top_authors_by_book_count': list(authors_with_counts),
         'recent_books': recent_books_data
-    })
+    }
 
 
 @api_view(['GET'])
-@permission_classes([permissions.AllowAny])
-def book_search(request):
+@permission_classes([AllowAny])
+def book_stats(request):
+    """
+    Custom endpoint to get comprehensive statistics about books.
+    
+    The payload is cached for BOOK_STATS_CACHE_TIMEOUT seconds and invalidated
+    whenever a book or author is saved or deleted (see api/signals.py).
+    """
+    stats = cache.get_or_set(BOOK_STATS_CACHE_KEY, _compute_book_stats, BOOK_STATS_CACHE_TIMEOUT)
+    return Response(stats)
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def book_count(request):
+    """
+    Total number of books.
+    
+    The cursor-paginated book lists do not return a count, so clients that
+    need a total use this endpoint. The value is cached like book_stats and
+    invalidated whenever a book or author is saved or deleted.
+    """
+    count = cache.get_or_set(BOOK_COUNT_CACHE_KEY, Book.objects.count, BOOK_STATS_CACHE_TIMEOUT)
+    return Response({'count': count})
+
+
+@method_decorator(PUBLIC_PAGE_CACHE, name='dispatch')
+class BookSearchView(generics.ListAPIView):
     """
     Advanced search endpoint for books with multiple search criteria.
     
@@ -316,63 +370,30 @@ def book_search(request):
     - year_min: Minimum publication year
     - year_max: Maximum publication year
     - author_id: Filter by specific author
-    - limit: Maximum number of results (default: 20)
-    """
-    search_term = request.GET.get('q', '')
-    year_min = request.GET.get('year_min')
-    year_max = request.GET.get('year_max')
-    author_id = request.GET.get('author_id')
-    limit = int(request.GET.get('limit', 20))
-    
-    queryset = Book.objects.select_related('author').all()
+    - limit: Results per page (default: 20, max: 100)
     
-    # Apply search term
-    if search_term:
-        queryset = queryset.filter(
-            Q(title__icontains=search_term) | 
-            Q(author__name__icontains=search_term)
-        )
-    
-    # Apply year filters
-    if year_min:
-        queryset = queryset.filter(publication_year__gte=year_min)
-    if year_max:
-        queryset = queryset.filter(publication_year__lte=year_max)
-    
-    # Apply author filter
-    if author_id:
-        queryset = queryset.filter(author_id=author_id)
-    
-    # Order by publication year descending and limit results
-    queryset = queryset.order_by('-publication_year')[:limit]
-    
-    serializer = BookSerializer(queryset, many=True)
-    
-    return Response({
-        'search_term': search_term,
-        'filters_applied': {
-            'year_min': year_min,
-            'year_max': year_max,
-            'author_id': author_id,
-        },
-        'results_count': len(serializer.data),
-        'books': serializer.data
-    })
+    Every BookFilter parameter is accepted as well. Results are
+    cursor-paginated, newest publication year first.
+    """
+    queryset = Book.objects.select_related('author').only(*BOOK_READ_FIELDS)
+    serializer_class = BookSerializer
+    permission_classes = [AllowAny]
+    filter_backends = (DjangoFilterBackend,)
+    filterset_class = BookSearchFilter
+    pagination_class = BookSearchCursorPagination
 
 
-@api_view(['GET'])
-@permission_classes([permissions.AllowAny])
-def author_analytics(request):
+# Authors are streamed from the database in batches of this size
+AUTHOR_ANALYTICS_CHUNK_SIZE = 500
+
+
+def _compute_author_analytics(min_books, sort_by):
     """
-    Analytics endpoint for authors with various statistics.
-    
-    Query Parameters:
-    - min_books: Minimum number of books (default: 1)
-    - sort_by: Sort by 'name', 'book_count', or 'latest_book' (default: 'name')
+    Build the author_analytics payload for one (min_books, sort_by) pair.
+    On PostgreSQL each author's books are aggregated into a JSON array in the
+    same query; other backends fetch them with a single prefetch query,
+    limited to the columns rendered in the response.
     """
-    min_books = int(request.GET.get('min_books', 1))
-    sort_by = request.GET.get('sort_by', 'name')
-    
     queryset = Author.objects.annotate(
         book_count=Count('books'),
         latest_book_year=Max('books__publication_year')
@@ -386,25 +407,76 @@ def author_analytics(request):
     else:  # default to name
         queryset = queryset.order_by('name')
     
-    # Get detailed data
-    authors_data = []
-    for author in queryset:
-        author_data = {
-            'id': author.id,
-            'name': author.name,
-            'book_count': author.book_count,
-            'latest_book_year': author.latest_book_year,
-            'books': [{'id': book.id, 'title': book.title, 'publication_year': book.publication_year} 
-                     for book in author.books.all()]
-        }
-        authors_data.append(author_data)
+    if connection.vendor == 'postgresql':
+        # Imported lazily: django.contrib.postgres needs psycopg installed
+        from django.contrib.postgres.aggregates import JSONBAgg
+
+        queryset = queryset.annotate(
+            books_json=JSONBAgg(
+                JSONObject(
+                    id='books__id',
+                    title='books__title',
+                    publication_year='books__publication_year',
+                ),
+                filter=Q(books__isnull=False),
+                default=[],
+                order_by='books__id',
+            )
+        ).values('id', 'name', 'book_count', 'latest_book_year', 'books_json')
+        authors_data = []
+        for row in queryset.iterator(chunk_size=AUTHOR_ANALYTICS_CHUNK_SIZE):
+            row['books'] = row.pop('books_json')
+            authors_data.append(row)
+    else:
+        queryset = queryset.prefetch_related(nested_books_prefetch())
+        # Get detailed data
+        authors_data = []
+        for author in queryset.iterator(chunk_size=AUTHOR_ANALYTICS_CHUNK_SIZE):
+            author_data = {
+                'id': author.id,
+                'name': author.name,
+                'book_count': author.book_count,
+                'latest_book_year': author.latest_book_year,
+                'books': [{'id': book.id, 'title': book.title, 'publication_year': book.publication_year} 
+                         for book in author.books.all()]
+            }
+            authors_data.append(author_data)
     
-    return Response({
+    return {
         'min_books_filter': min_books,
         'sort_by': sort_by,
         'total_authors': len(authors_data),
         'authors': authors_data
-    })
+    }
+
+
+@api_view(['GET'])
+@permission_classes([AllowAny])
+def author_analytics(request):
+    """
+    Analytics endpoint for authors with various statistics.
+    
+    Query Parameters:
+    - min_books: Minimum number of books (default: 1)
+    - sort_by: Sort by 'name', 'book_count', or 'latest_book' (default: 'name')
+    
+    Invalid parameters are rejected with a 400 response.
+    
+    Each (min_books, sort_by) combination is cached for
+    AUTHOR_ANALYTICS_CACHE_TIMEOUT seconds and invalidated whenever a book or
+    author is saved or deleted (see api/signals.py).
+    """
+    params = AuthorAnalyticsParamsSerializer(data=request.query_params)
+    params.is_valid(raise_exception=True)
+    min_books = params.validated_data['min_books']
+    sort_by = params.validated_data['sort_by']
+    
+    analytics = cache.get_or_set(
+        author_analytics_cache_key(min_books, sort_by),
+        lambda: _compute_author_analytics(min_books, sort_by),
+        AUTHOR_ANALYTICS_CACHE_TIMEOUT
+    )
+    return Response(analytics)
 
 
 # All imports already done at the top